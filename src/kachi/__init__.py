@@ -1,4 +1,4 @@
-from .main import is_protected_link, unsafe_link  # noqa: F401
+from .main import is_protected_link, unsafe_link, unsafe_links  # noqa: F401
 from .schemas import Extract, Filter, Rule, RuleSet, Transform  # noqa: F401
 
 try:
@@ -1,14 +1,29 @@
+from collections.abc import Iterable
+from functools import lru_cache
 from pathlib import Path
-from urllib.parse import urlparse
 
 from .schemas import RuleSet
 
 base_rule_directory = Path(__file__).parent / "rules"
 
 
+@lru_cache(maxsize=4096)
+def _unsafe_link(url: str) -> str | None:
+    rule_set = RuleSet.from_directory(base_rule_directory)
+    return rule_set.call(url)
+
+
+@lru_cache(maxsize=4096)
+def _is_protected_link(url: str) -> bool:
+    rule_set = RuleSet.from_directory(base_rule_directory)
+    return rule_set.matches(url)
+
+
 def unsafe_link(url: str, *, rule_set: RuleSet | None = None) -> str | None:
     """Make a (protected) link unsafe.
 
+    Results for the built-in rule set are cached per URL.
+
     Args:
         url (str): URL
         rule_set (RuleSet | None, optional): Rule set to use. If None, load from the built-in rule directory. Defaults to None.
@@ -16,20 +31,47 @@ def unsafe_link(url: str, *, rule_set: RuleSet | None = None) -> str | None:
     Returns:
         str | None: Unsafe link or None if no rule matched.
     """
-    rule_set = rule_set or RuleSet.from_directory(base_rule_directory)
+    if rule_set is None:
+        return _unsafe_link(url)
+
     return rule_set.call(url)
 
 
+def unsafe_links(
+    urls: Iterable[str], *, rule_set: RuleSet | None = None
+) -> list[str | None]:
+    """Make (protected) links unsafe in bulk.
+
+    Results for the built-in rule set are cached per URL, so repeated links
+    in a batch are resolved once.
+
+    Args:
+        urls (Iterable[str]): URLs
+        rule_set (RuleSet | None, optional): Rule set to use. If None, load from the built-in rule directory. Defaults to None.
+
+    Returns:
+        list[str | None]: Unsafe links (or None if no rule matched) in the same order as the URLs.
+    """
+    if rule_set is None:
+        return [_unsafe_link(url) for url in urls]
+
+    call = rule_set.call
+    return [call(url) for url in urls]
+
+
 def is_protected_link(url: str, *, rule_set: RuleSet | None = None) -> bool:
     """Check if the link is a protected link.
 
+    Results for the built-in rule set are cached per URL.
+
     Args:
         url (str): URL
         rule_set (RuleSet | None, optional): Rule set to use. If None, load from the built-in rule directory. Defaults to None.
     Returns:
         bool: True if the link is a protected link, False otherwise.
     """
-    rule_set = rule_set or RuleSet.from_directory(base_rule_directory)
+    if rule_set is None:
+        return _is_protected_link(url)
+
     # do quick check whether it's a protected link (= supported by any of the rules)
-    parsed = urlparse(url)
-    return any(rule.filter.matches(url, parsed=parsed) for rule in rule_set.rules)
+    return rule_set.matches(url)
@@ -2,16 +2,30 @@ from __future__ import annotations
 
 import base64
 import html
+import operator
 import re
+import threading
+import warnings
+from collections.abc import Callable
 from dataclasses import dataclass, field
 from enum import Enum
-from functools import cache
+from functools import cache, lru_cache, partial
 from pathlib import Path
 from typing import Any
-from urllib.parse import ParseResult, parse_qs, unquote, urlparse
+from urllib.parse import ParseResult, unquote, unquote_plus, urlparse, uses_params
 
 import yaml
 
+try:
+    from yaml import CSafeLoader as _SafeLoader
+except ImportError:  # pragma: no cover
+    from yaml import SafeLoader as _SafeLoader  # type: ignore[assignment]
+
+try:
+    import hyperscan
+except ImportError:  # pragma: no cover
+    hyperscan = None  # type: ignore[assignment]
+
 
 def _to_matchers(value: str | list[str]) -> list[Matcher]:
     if isinstance(value, str):
@@ -23,7 +37,135 @@ _VALID_TRANSFORM_NAMES = frozenset(
     {"html_unescape", "url_decode", "base64_decode", "prepend", "proofpoint_v2_decode"}
 )
 _PARAMETERIZED_TRANSFORMS = frozenset({"prepend"})
-_PROOFPOINT_V2_RE = re.compile(r"-([0-9A-Fa-f]{2})")
+# "-XX" escapes used by Proofpoint v2, keyed by the two hex digits
+_PROOFPOINT_V2_HEX_TABLE = {
+    a + b: chr(int(a + b, 16))
+    for a in "0123456789abcdefABCDEF"
+    for b in "0123456789abcdefABCDEF"
+}
+
+
+# decoded values repeat a lot when scanning a batch of links from the same
+# mailing, so the decoders are memoized with small LRU caches. Each one is a
+# module-level function of its own so that Transform (and Rule) pickle.
+@lru_cache(maxsize=1024)
+def _html_unescape(value: str) -> str:
+    return html.unescape(value)
+
+
+@lru_cache(maxsize=1024)
+def _url_decode(value: str) -> str:
+    return unquote(value)
+
+
+@lru_cache(maxsize=1024)
+def _base64_decode(value: str) -> str:
+    return base64.b64decode(value).decode()
+
+
+@lru_cache(maxsize=1024)
+def _proofpoint_v2_decode(value: str) -> str:
+    head, *parts = value.split("-")
+    decoded = [head]
+    for part in parts:
+        char = _PROOFPOINT_V2_HEX_TABLE.get(part[:2])
+        decoded.append(char + part[2:] if char is not None else "-" + part)
+
+    return "".join(decoded).replace("_", "/")
+
+
+_TRANSFORM_FUNCTIONS: dict[str, Callable[[str], str]] = {
+    "html_unescape": _html_unescape,
+    "url_decode": _url_decode,
+    "base64_decode": _base64_decode,
+    "proofpoint_v2_decode": _proofpoint_v2_decode,
+}
+
+
+_SCHEME_CHARS = "abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789+-."
+
+
+def _fast_parse(url: str) -> tuple[str, str, str]:
+    """Split a URL into (hostname, path, query) the same way urlparse() does.
+
+    Only the components used by the rules are computed and no ParseResult is
+    allocated. Unusual input (control characters, leading spaces, IPv6, zone
+    IDs or non-ASCII netlocs) is delegated to urlparse() to keep its semantics.
+    """
+    if not url.isprintable() or url[:1] == " ":
+        return _split_parsed(urlparse(url))
+
+    original = url
+    scheme = ""
+    i = url.find(":")
+    if i > 0 and url[0].isascii() and url[0].isalpha():
+        candidate = url[:i]
+        if not candidate.strip(_SCHEME_CHARS):
+            scheme, url = candidate.lower(), url[i + 1 :]
+
+    hostname = ""
+    if url[:2] == "//":
+        end = len(url)
+        for c in "/?#":
+            pos = url.find(c, 2)
+            if pos >= 0 and pos < end:
+                end = pos
+
+        netloc = url[2:end]
+        if "[" in netloc or "]" in netloc or "%" in netloc or not netloc.isascii():
+            return _split_parsed(urlparse(original))
+
+        hostname = netloc.rpartition("@")[2].partition(":")[0].lower()
+        url = url[end:]
+
+    url = url.partition("#")[0]
+    path, _, query = url.partition("?")
+    if scheme in uses_params and ";" in path:
+        slash = path.rfind("/")
+        semicolon = path.find(";", slash) if slash >= 0 else path.find(";")
+        if semicolon >= 0:
+            path = path[:semicolon]
+
+    return hostname, path, query
+
+
+def _split_parsed(parsed: ParseResult) -> tuple[str, str, str]:
+    return parsed.hostname or "", parsed.path, parsed.query
+
+
+def _get_query_value(query: str, keys: tuple[str, ...], first: bool) -> str | None:
+    """Look up a query parameter with the same semantics as parse_qs().
+
+    Only the values of the requested keys are decoded and no dict of lists is
+    built. The first key (in order of keys) present with a non-blank value wins;
+    first selects its first or last occurrence.
+    """
+    found: dict[str, str] = {}
+    for pair in query.split("&"):
+        name, _, value = pair.partition("=")
+        # parse_qs() drops pairs without "=" and blank values
+        if not value:
+            continue
+
+        if "%" in name or "+" in name:
+            name = unquote_plus(name)
+
+        if name not in keys:
+            continue
+
+        if first:
+            if name == keys[0]:
+                return unquote_plus(value)
+
+            found.setdefault(name, value)
+        else:
+            found[name] = value
+
+    for key in keys:
+        if key in found:
+            return unquote_plus(found[key])
+
+    return None
 
 
 class ExtractSource(Enum):
@@ -37,18 +179,29 @@ class ParamSelect(Enum):
     LAST = "last"
 
 
-@dataclass
+@dataclass(slots=True)
 class Matcher:
     """A pattern that matches via exact string comparison or regex.
 
     Raw value from YAML: bare string = exact match, ``/pattern/`` = regex.
+    Filter and RuleSet aggregate matchers into sets and combined patterns at
+    construction time, so matches() is not used while scanning URLs.
     """
 
     raw: str
 
-    is_regex: bool = field(init=False)
-    pattern: str = field(init=False)
-    _compiled: re.Pattern[str] | None = field(init=False, default=None, repr=False)
+    is_regex: bool = field(init=False, compare=False)
+    pattern: str = field(init=False, compare=False)
+    _compiled: re.Pattern[str] | None = field(
+        init=False, default=None, repr=False, compare=False
+    )
+    # body of a fully anchored (^...$) regex, matched with fullmatch() instead
+    _anchored_body: str | None = field(
+        init=False, default=None, repr=False, compare=False
+    )
+    _match: Callable[[str], re.Match[str] | None] | None = field(
+        init=False, default=None, repr=False, compare=False
+    )
 
     def __post_init__(self) -> None:
         if not self.raw:
@@ -65,29 +218,137 @@ class Matcher:
             except re.error as e:
                 raise ValueError(f"invalid regex /{self.pattern}/: {e}") from e
 
+            self._match = self._compiled.search
+            body = _strip_anchors(self.pattern)
+            if body is not None:
+                try:
+                    # "$" also matches before a trailing newline
+                    self._match = re.compile(f"(?:{body})\n?").fullmatch
+                    self._anchored_body = body
+                except re.error:
+                    pass
+
     def matches(self, value: str) -> bool:
-        if self._compiled is not None:
-            return self._compiled.search(value) is not None
+        if self._match is not None:
+            return self._match(value) is not None
 
         return value == self.pattern
 
 
-@dataclass
+def _strip_anchors(pattern: str) -> str | None:
+    """Return the body of a ``^...$`` pattern, or None if it is not fully anchored.
+
+    Patterns with "|" are skipped since the anchors may bind to a single branch.
+    """
+    if len(pattern) < 2 or pattern[0] != "^" or pattern[-1] != "$":
+        return None
+
+    body = pattern[1:-1]
+    if "|" in body:
+        return None
+
+    # an odd number of trailing backslashes means the "$" is escaped
+    if (len(body) - len(body.rstrip("\\"))) % 2:
+        return None
+
+    return body
+
+
+def _literal_patterns(matchers: list[Matcher]) -> frozenset[str]:
+    return frozenset(m.pattern for m in matchers if not m.is_regex)
+
+
+def _regex_patterns(matchers: list[Matcher]) -> list[re.Pattern[str]]:
+    return [m._compiled for m in matchers if m._compiled is not None]
+
+
+def _regex_matchers(
+    matchers: list[Matcher],
+) -> list[Callable[[str], re.Match[str] | None]]:
+    return [m._match for m in matchers if m._match is not None]
+
+
+# backreferences and conditional group references, which would point at the
+# wrong group once a pattern is embedded in a larger one
+_BACKREFERENCE_RE = re.compile(r"\\[1-9]|\\g<|\(\?P=|\(\?\(\d")
+
+
+def _compile_fused(pattern: str) -> re.Pattern[str] | None:
+    """Compile a pattern fused from several others, or return None if it fails.
+
+    Python 3.10 only warns about inline global flags past the start of a
+    pattern and then applies them to all of it, so the warning is a failure.
+    """
+    with warnings.catch_warnings():
+        warnings.simplefilter("error", DeprecationWarning)
+        try:
+            return re.compile(pattern)
+        except (re.error, DeprecationWarning):
+            return None
+
+
+def _fuse_patterns(patterns: list[re.Pattern[str]]) -> list[re.Pattern[str]]:
+    """Fuse patterns into a single alternation so one search() covers them all.
+
+    The patterns are returned as-is when they cannot be joined safely
+    (group references would be renumbered, inline flags or group names may
+    clash).
+    """
+    if len(patterns) < 2:
+        return patterns
+
+    if any(_BACKREFERENCE_RE.search(p.pattern) for p in patterns):
+        return patterns
+
+    fused = _compile_fused("|".join(f"(?:{p.pattern})" for p in patterns))
+    return [fused] if fused is not None else patterns
+
+
+@dataclass(slots=True)
 class Filter:
     hostname: list[Matcher]
     path: list[Matcher] = field(default_factory=list)
 
+    _literal_hosts: frozenset[str] = field(init=False, repr=False, compare=False)
+    _regex_hosts: list[Callable[[str], re.Match[str] | None]] = field(
+        init=False, repr=False, compare=False
+    )
+    _literal_paths: frozenset[str] = field(init=False, repr=False, compare=False)
+    _regex_paths: list[re.Pattern[str]] = field(init=False, repr=False, compare=False)
+
     def __post_init__(self) -> None:
         if not self.hostname:
             raise ValueError("at least one hostname matcher is required")
 
+        self._literal_hosts = _literal_patterns(self.hostname)
+        self._regex_hosts = _regex_matchers(self.hostname)
+        self._literal_paths = _literal_patterns(self.path)
+        self._regex_paths = _fuse_patterns(_regex_patterns(self.path))
+
     def matches(self, url: str, *, parsed: ParseResult | None = None) -> bool:
-        parsed = parsed or urlparse(url)
-        hostname = parsed.hostname or ""
-        if not any(m.matches(hostname) for m in self.hostname):
+        hostname, path, _ = (
+            _split_parsed(parsed) if parsed is not None else _fast_parse(url)
+        )
+        return self._matches(hostname, path)
+
+    def _matches(self, hostname: str, path: str) -> bool:
+        if hostname not in self._literal_hosts and not self._matches_regex_hostname(
+            hostname
+        ):
             return False
 
-        return not self.path or any(m.matches(parsed.path) for m in self.path)
+        return self._matches_path(path)
+
+    def _matches_regex_hostname(self, hostname: str) -> bool:
+        return any(match(hostname) for match in self._regex_hosts)
+
+    def _matches_path(self, path: str) -> bool:
+        if not self.path:
+            return True
+
+        return path in self._literal_paths or any(
+            p.search(path) for p in self._regex_paths
+        )
 
     @classmethod
     def from_dict(cls, data: dict[str, Any]) -> Filter:
@@ -97,11 +358,13 @@ class Filter:
         )
 
 
-@dataclass
+@dataclass(slots=True)
 class Transform:
     name: str
     value: str | None = None
 
+    _fn: Callable[[str], str] = field(init=False, repr=False, compare=False)
+
     def __post_init__(self) -> None:
         if self.name not in _VALID_TRANSFORM_NAMES:
             raise ValueError(
@@ -115,24 +378,13 @@ class Transform:
         if self.name not in _PARAMETERIZED_TRANSFORMS and self.value is not None:
             raise ValueError(f"transform {self.name!r} does not accept a value")
 
-    def call(self, value: str) -> str:
-        match self.name:
-            case "html_unescape":
-                return html.unescape(value)
-            case "url_decode":
-                return unquote(value)
-            case "base64_decode":
-                return base64.b64decode(value).decode()
-            case "prepend":
-                return self.value + value  # type: ignore[operator]
-            case "proofpoint_v2_decode":
-                decoded = _PROOFPOINT_V2_RE.sub(
-                    lambda m: chr(int(m.group(1), 16)),
-                    value,
-                )
-                return decoded.replace("_", "/")
+        if self.name == "prepend":
+            self._fn = partial(operator.add, self.value)
+        else:
+            self._fn = _TRANSFORM_FUNCTIONS[self.name]
 
-        raise ValueError(f"unknown transform {self.name!r}")
+    def call(self, value: str) -> str:
+        return self._fn(value)
 
     @classmethod
     def from_dict(cls, data: str | dict[str, Any]) -> Transform:
@@ -143,15 +395,23 @@ class Transform:
         return cls(name=name, value=data[name])
 
 
-@dataclass
+# (url, path, query) -> extracted value
+_Extractor = Callable[[str, str, str], str | None]
+
+
+@dataclass(slots=True)
 class Extract:
     source: ExtractSource
     keys: list[str] = field(default_factory=list)
     pattern: str | None = None
     select: ParamSelect = ParamSelect.FIRST
     _compiled_pattern: re.Pattern[str] | None = field(
-        init=False, default=None, repr=False
+        init=False, default=None, repr=False, compare=False
     )
+    # per-source extractor, bound once so _call() does not branch on source
+    _call: _Extractor = field(init=False, repr=False, compare=False)
+    _keys: tuple[str, ...] = field(init=False, default=(), repr=False, compare=False)
+    _first: bool = field(init=False, default=True, repr=False, compare=False)
 
     def __post_init__(self) -> None:
         match self.source:
@@ -163,6 +423,10 @@ class Extract:
                     raise ValueError(
                         "'pattern' is not allowed when source is 'query_param'"
                     )
+
+                self._keys = tuple(self.keys)
+                self._first = self.select == ParamSelect.FIRST
+                self._call = self._call_query_param
             case ExtractSource.PATH_REGEX | ExtractSource.URL_REGEX:
                 if self.pattern is None:
                     raise ValueError(
@@ -184,26 +448,28 @@ class Extract:
                         f"{self.source.value} pattern must contain at least one capture group"
                     )
 
+                self._call = (
+                    self._call_path_regex
+                    if self.source == ExtractSource.PATH_REGEX
+                    else self._call_url_regex
+                )
+
     def call(self, url: str, *, parsed: ParseResult | None = None) -> str | None:
-        parsed = parsed or urlparse(url)
-        match self.source:
-            case ExtractSource.QUERY_PARAM:
-                qs = parse_qs(parsed.query)
-                for key in self.keys:
-                    values = qs.get(key, [])
-                    if values:
-                        return (
-                            values[0]
-                            if self.select == ParamSelect.FIRST
-                            else values[-1]
-                        )
-                return None
-            case ExtractSource.PATH_REGEX:
-                m = self._compiled_pattern.search(parsed.path)  # type: ignore[union-attr]
-                return m.group(1) if m else None
-            case ExtractSource.URL_REGEX:
-                m = self._compiled_pattern.search(url)  # type: ignore[union-attr]
-                return m.group(1) if m else None
+        _, path, query = (
+            _split_parsed(parsed) if parsed is not None else _fast_parse(url)
+        )
+        return self._call(url, path, query)
+
+    def _call_query_param(self, _url: str, _path: str, query: str) -> str | None:
+        return _get_query_value(query, self._keys, self._first)
+
+    def _call_path_regex(self, _url: str, path: str, _query: str) -> str | None:
+        m = self._compiled_pattern.search(path)  # type: ignore[union-attr]
+        return m.group(1) if m else None
+
+    def _call_url_regex(self, url: str, _path: str, _query: str) -> str | None:
+        m = self._compiled_pattern.search(url)  # type: ignore[union-attr]
+        return m.group(1) if m else None
 
     @classmethod
     def from_dict(cls, data: dict[str, Any]) -> Extract:
@@ -223,7 +489,7 @@ class Extract:
         )
 
 
-@dataclass
+@dataclass(slots=True)
 class Rule:
     name: str
     filter: Filter
@@ -231,24 +497,54 @@ class Rule:
     pre_extract: list[Transform] = field(default_factory=list)
     post_extract: list[Transform] = field(default_factory=list)
 
+    # bound once so call() does no per-step attribute lookups
+    _pre_fns: tuple[Callable[[str], str], ...] = field(
+        init=False, repr=False, compare=False
+    )
+    _post_fns: tuple[Callable[[str], str], ...] = field(
+        init=False, repr=False, compare=False
+    )
+    _reparse: bool = field(init=False, repr=False, compare=False)
+
     def __post_init__(self) -> None:
         if not self.name:
             raise ValueError("rule name must not be empty")
 
+        self._pre_fns = tuple(t._fn for t in self.pre_extract)
+        self._post_fns = tuple(t._fn for t in self.post_extract)
+        # url_regex works on the raw string, so only the other sources
+        # need the URL rewritten by pre_extract to be parsed again
+        self._reparse = (
+            bool(self.pre_extract) and self.extract.source != ExtractSource.URL_REGEX
+        )
+
     def call(self, url: str, *, parsed: ParseResult | None = None) -> str | None:
-        parsed = parsed or urlparse(url)
-        if not self.filter.matches(url, parsed=parsed):
+        hostname, path, query = (
+            _split_parsed(parsed) if parsed is not None else _fast_parse(url)
+        )
+        return self._call(url, hostname, path, query)
+
+    def _call(self, url: str, hostname: str, path: str, query: str) -> str | None:
+        if not self.filter._matches(hostname, path):
             return None
 
-        for t in self.pre_extract:
-            url = t.call(url)
+        return self._extract_matched(url, path, query)
 
-        result = self.extract.call(url, parsed=parsed if not self.pre_extract else None)
+    def _extract_matched(self, url: str, path: str, query: str) -> str | None:
+        """Run the transforms and extraction for a URL that passed the filter."""
+        if self._pre_fns:
+            for fn in self._pre_fns:
+                url = fn(url)
+
+            if self._reparse:
+                _, path, query = _fast_parse(url)
+
+        result = self.extract._call(url, path, query)
         if result is None:
             return None
 
-        for t in self.post_extract:
-            result = t.call(result)
+        for fn in self._post_fns:
+            result = fn(result)
 
         return result
 
@@ -268,16 +564,159 @@ class Rule:
         )
 
     @staticmethod
-    @cache
     def from_file(path: str | Path) -> Rule:
-        data = yaml.safe_load(Path(path).read_text())
-        return Rule.from_dict(data)
+        """Load a rule from a YAML file.
+
+        Parsed rules are cached on (path, mtime), so an edited file is picked
+        up again. RuleSet.from_directory() caches whole rule sets per
+        directory, so edits are not seen through it (or through the built-in
+        rule set) until the process restarts.
+        """
+        path = Path(path)
+        return _rule_from_file(path, path.stat().st_mtime_ns)
+
 
+# bounded, so stale (path, mtime) entries of edited files are evicted
+@lru_cache(maxsize=256)
+def _rule_from_file(path: Path, _mtime_ns: int) -> Rule:
+    data = yaml.load(path.read_bytes(), Loader=_SafeLoader)
+    return Rule.from_dict(data)
+
+
+# syntax that both re and hyperscan accept but read differently: POSIX
+# classes and collating elements, \Z/\z, \N, \s/\S (re also counts
+# \x1c-\x1f as whitespace) and verbose mode
+_HYPERSCAN_UNSAFE_RE = re.compile(r"\[[:.=]|\\[ZzNsS]|\(\?[a-zA-Z]*x")
+# {n}, {n,} and {n,m} are the only brace forms both read as quantifiers
+# (e.g. re reads {,n} as {0,n} while hyperscan matches it literally)
+_QUANTIFIER_BRACE_RE = re.compile(r"\{\d+(?:,\d*)?\}")
+
+
+def _hyperscan_compatible(pattern: str) -> bool:
+    """Check whether hyperscan would read the pattern the same way re does.
+
+    This is deliberately conservative: a false negative only costs speed,
+    as the pattern is then matched with re.
+    """
+    if not pattern.isascii() or _HYPERSCAN_UNSAFE_RE.search(pattern):
+        return False
+
+    return "{" not in _QUANTIFIER_BRACE_RE.sub("", pattern)
+
+
+def _compile_host_database(expressions: list[str], ids: list[int]) -> Any:
+    """Compile hostname regexes into a hyperscan block-mode database.
+
+    Returns None if hyperscan rejects any of the expressions (e.g. lookarounds
+    or backreferences), in which case the stdlib re module is used instead.
+    """
+    database = hyperscan.Database(mode=hyperscan.HS_MODE_BLOCK)
+    flags = (
+        hyperscan.HS_FLAG_SINGLEMATCH
+        | hyperscan.HS_FLAG_ALLOWEMPTY
+        | hyperscan.HS_FLAG_UTF8
+        | hyperscan.HS_FLAG_UCP
+    )
+    try:
+        database.compile(
+            expressions=[e.encode() for e in expressions],
+            ids=ids,
+            elements=len(expressions),
+            flags=flags,
+        )
+    except hyperscan.error:
+        return None
+
+    return database
+
+
+def _collect_hyperscan_match(
+    id_: int, _from: int, _to: int, _flags: int, context: list[int]
+) -> None:
+    context.append(id_)
+
+
+class _HostDatabase:
+    """Hyperscan database over the hostname regexes of a rule set.
+
+    Compiling is by far the most expensive part of building a rule set, so it
+    happens on first use. The database, its lock and the per-thread scratch
+    space can be neither copied nor pickled, so copies start empty and compile
+    again.
+    """
 
-@dataclass
+    __slots__ = ("_compiled", "_database", "_local", "_lock", "expressions", "ids")
+
+    def __init__(self, expressions: list[str], ids: list[int]) -> None:
+        self.expressions = expressions
+        self.ids = ids
+        self._database: Any = None
+        self._compiled = False
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    def __reduce__(self) -> tuple[Any, ...]:
+        return (self.__class__, (self.expressions, self.ids))
+
+    def scan(self, hostname: str) -> list[int] | None:
+        """Return the ids of the matching expressions, or None if hyperscan
+        rejected the database."""
+        database = self._get_database()
+        if database is None:
+            return None
+
+        matched: list[int] = []
+        database.scan(
+            hostname.encode(),
+            match_event_handler=_collect_hyperscan_match,
+            context=matched,
+            scratch=self._get_scratch(database),
+        )
+        return sorted(matched)
+
+    def _get_database(self) -> Any:
+        if not self._compiled:
+            with self._lock:
+                if not self._compiled:
+                    self._database = _compile_host_database(self.expressions, self.ids)
+                    self._compiled = True
+
+        return self._database
+
+    def _get_scratch(self, database: Any) -> Any:
+        # hyperscan scratch space must not be shared between threads
+        scratch = getattr(self._local, "scratch", None)
+        if scratch is None:
+            scratch = hyperscan.Scratch(database)
+            self._local.scratch = scratch
+
+        return scratch
+
+
+@dataclass(slots=True)
 class RuleSet:
     rules: list[Rule]
 
+    _host_index: dict[str, list[int]] = field(
+        init=False, default_factory=dict, repr=False, compare=False
+    )
+    _host_regex: re.Pattern[str] | None = field(
+        init=False, default=None, repr=False, compare=False
+    )
+    _host_regex_groups: list[tuple[str, int]] = field(
+        init=False, default_factory=list, repr=False, compare=False
+    )
+    # optional hyperscan (DFA) database used in place of _host_regex
+    _host_database: _HostDatabase | None = field(
+        init=False, default=None, repr=False, compare=False
+    )
+    # exact hostnames matched by at least one rule without a path filter
+    _pathless_hosts: frozenset[str] = field(init=False, repr=False, compare=False)
+    # (path filter, extraction) bound methods per rule, indexed like rules
+    _fast_rules: list[tuple[Callable[[str], bool], _Extractor]] = field(
+        init=False, repr=False, compare=False
+    )
+
     def __post_init__(self) -> None:
         if not self.rules:
             raise ValueError("at least one rule is required")
@@ -287,10 +726,127 @@ class RuleSet:
         if duplicates:
             raise ValueError(f"duplicate rule names: {sorted(duplicates)}")
 
-    def call(self, url: str) -> str | None:
-        parsed = urlparse(url)
-        for rule in self.rules:
-            result = rule.call(url, parsed=parsed)
+        self._build_host_dispatch()
+        self._fast_rules = [
+            (r.filter._matches_path, r._extract_matched) for r in self.rules
+        ]
+
+    def _build_host_dispatch(self) -> None:
+        # every regex hostname matcher of a rule is folded into an optional
+        # lookahead with a named group, so a single match() call reports all
+        # the rules whose hostname regexes match (not just the first one)
+        alternatives: list[str] = []
+        expressions: list[str] = []
+        use_hyperscan = hyperscan is not None
+        for i, rule in enumerate(self.rules):
+            regexes = [m for m in rule.filter.hostname if m.is_regex]
+            if not regexes:
+                continue
+
+            group = f"_r{i}"
+            # the lookahead sits at position 0, so anchored patterns are
+            # matched in place rather than searched for
+            scanned = "|".join(
+                f"(?:{m._anchored_body})\\n?\\Z"
+                if m._anchored_body is not None
+                else f".*?(?:{m.pattern})"
+                for m in regexes
+            )
+            alternatives.append(f"(?:(?=(?P<{group}>{scanned}))|)")
+            self._host_regex_groups.append((group, i))
+            use_hyperscan = use_hyperscan and all(
+                _hyperscan_compatible(m.pattern) for m in regexes
+            )
+            expressions.append("|".join(f"(?:{m.pattern})" for m in regexes))
+
+        # a single incompatible pattern keeps the whole set on re, so every
+        # lookup (and Filter.matches) agrees on the same semantics
+        if use_hyperscan and expressions:
+            self._host_database = _HostDatabase(
+                expressions, [i for _, i in self._host_regex_groups]
+            )
+
+        if alternatives and not _BACKREFERENCE_RE.search("".join(alternatives)):
+            # None on e.g. conflicting group names or inline flags across
+            # rules; each rule's regexes are then matched one by one
+            self._host_regex = _compile_fused("".join(alternatives))
+
+        # exact hostnames resolve with a dict lookup. Regex rules matching the
+        # same hostname are merged in upfront, so a hit needs no regex search.
+        for i, rule in enumerate(self.rules):
+            for m in rule.filter.hostname:
+                if not m.is_regex:
+                    self._host_index.setdefault(m.pattern, []).append(i)
+
+        for hostname, indexes in self._host_index.items():
+            merged = set(indexes) | set(self._match_host_re(hostname))
+            self._host_index[hostname] = sorted(merged)
+
+        self._pathless_hosts = frozenset(
+            hostname
+            for hostname, indexes in self._host_index.items()
+            if any(not self.rules[i].filter.path for i in indexes)
+        )
+
+    def _match_host_regex(self, hostname: str) -> list[int]:
+        if self._host_database is not None and hostname.isascii():
+            matched = self._host_database.scan(hostname)
+            if matched is not None:
+                return matched
+
+        return self._match_host_re(hostname)
+
+    def _match_host_re(self, hostname: str) -> list[int]:
+        if not self._host_regex_groups:
+            return []
+
+        if self._host_regex is None:
+            return [
+                i
+                for _, i in self._host_regex_groups
+                if self.rules[i].filter._matches_regex_hostname(hostname)
+            ]
+
+        m = self._host_regex.match(hostname)
+        if m is None:
+            return []
+
+        return [i for group, i in self._host_regex_groups if m.group(group) is not None]
+
+    def _candidates(self, hostname: str) -> list[int]:
+        """Return indexes (in rule order) of the rules whose hostname filter matches."""
+        indexes = self._host_index.get(hostname)
+        if indexes is not None:
+            return indexes
+
+        return self._match_host_regex(hostname)
+
+    def matches(self, url: str, *, parsed: ParseResult | None = None) -> bool:
+        hostname, path, _ = (
+            _split_parsed(parsed) if parsed is not None else _fast_parse(url)
+        )
+        if hostname in self._pathless_hosts:
+            return True
+
+        # candidates already match on hostname, so only their paths are left
+        fast_rules = self._fast_rules
+        return any(fast_rules[i][0](path) for i in self._candidates(hostname))
+
+    def call(self, url: str, *, parsed: ParseResult | None = None) -> str | None:
+        hostname, path, query = (
+            _split_parsed(parsed) if parsed is not None else _fast_parse(url)
+        )
+        candidates = self._candidates(hostname)
+        if not candidates:
+            return None
+
+        fast_rules = self._fast_rules
+        for i in candidates:
+            matches_path, extract = fast_rules[i]
+            if not matches_path(path):
+                continue
+
+            result = extract(url, path, query)
             if result is not None:
                 return result
 
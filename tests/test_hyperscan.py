@@ -0,0 +1,60 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from kachi import unsafe_link
+
+from .utils import make_rule_set
+
+pytest.importorskip("hyperscan")
+
+
+def test_hyperscan_database() -> None:
+    rule_set = make_rule_set(
+        r"/\.safelinks\.example\.com$/", r"/^nam\d+\.example\.com$/"
+    )
+    assert unsafe_link("https://nam01.example.com/?u=1", rule_set=rule_set) == "1"
+    assert unsafe_link("https://a.safelinks.example.com/?u=2", rule_set=rule_set) == "2"
+    assert unsafe_link("https://example.com/?u=3", rule_set=rule_set) is None
+    assert rule_set._host_database is not None
+    assert rule_set._host_database._get_database() is not None
+
+
+@pytest.mark.filterwarnings("ignore:Possible nested set:FutureWarning")
+@pytest.mark.parametrize(
+    ("hostname", "url", "expected"),
+    [
+        # re reads {,3} as {0,3}, hyperscan as literal text
+        (r"/^ab{,3}\.com$/", "https://abb.com/?u=1", "1"),
+        # re reads [[:alpha:]] as a character set, hyperscan as a POSIX class
+        (r"/[[:alpha:]]+\.com$/", "https://example.com/?u=1", None),
+        # re counts \x1c as whitespace, hyperscan does not
+        (r"/a\sb/", "https://a\x1cb/?u=1", "1"),
+    ],
+)
+def test_hyperscan_incompatible_patterns_use_re(
+    hostname: str, url: str, expected: str | None
+) -> None:
+    rule_set = make_rule_set(hostname)
+    assert unsafe_link(url, rule_set=rule_set) == expected
+    assert rule_set._host_database is None
+
+
+def test_hyperscan_scratch_per_thread() -> None:
+    rule_set = make_rule_set(r"/\.example\.com$/")
+    barrier = threading.Barrier(4)
+
+    def scan(i: int) -> tuple[str | None, int]:
+        barrier.wait()
+        result = None
+        for _ in range(100):
+            result = unsafe_link(f"https://a{i}.example.com/?u={i}", rule_set=rule_set)
+
+        return result, id(rule_set._host_database._local.scratch)
+
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        results = list(executor.map(scan, range(4)))
+
+    assert [r for r, _ in results] == ["0", "1", "2", "3"]
+    assert len({scratch for _, scratch in results}) == 4
@@ -0,0 +1,30 @@
+from typing import Any
+
+from kachi import RuleSet
+
+
+def make_rule_set(*rules: str | dict[str, Any], **extract: Any) -> RuleSet:
+    """Build a rule set of query_param rules that extract "u".
+
+    Each rule is either a hostname or a rule dict whose "filter" and "extract"
+    are merged over the defaults. Keyword arguments apply to every extract.
+    """
+    data: list[dict[str, Any]] = []
+    for i, rule in enumerate(rules):
+        if isinstance(rule, str):
+            rule = {"filter": {"hostname": rule}}
+
+        data.append(
+            {
+                "name": f"rule{i}",
+                "filter": rule["filter"],
+                "extract": {
+                    "from": "query_param",
+                    "keys": ["u"],
+                    **extract,
+                    **rule.get("extract", {}),
+                },
+            }
+        )
+
+    return RuleSet.from_dict({"rules": data})